@@ -2,12 +2,14 @@ from fastapi import APIRouter, UploadFile, File, HTTPException
 from typing import List
 import logging
 
-from app.services.summarizer import process_tender_multi_file
+from app.services.summarizer import process_tender_multi_file, process_tenders_batched
 from app.services.response_formatter import format_response_by_portal
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/tender", tags=["tender"])
 
+MAX_BATCH_TENDERS = 20
+
 @router.post("/process", response_model=dict)
 async def process_tender_api(
     pdf_files: List[UploadFile] = File(..., description="Single or multiple tender PDF files")
@@ -43,3 +45,41 @@ async def process_tender_api(
     except Exception as e:
         logger.error(f"Process failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/process-batch", response_model=dict)
+async def process_tender_batch_api(
+    pdf_files: List[UploadFile] = File(..., description="One PDF per independent tender")
+):
+    """Summarize several independent single-file tenders, batching small ones into shared LLM calls."""
+    try:
+        if not pdf_files:
+            raise HTTPException(status_code=400, detail="At least one PDF file required")
+        if len(pdf_files) > MAX_BATCH_TENDERS:
+            raise HTTPException(status_code=400, detail=f"Maximum {MAX_BATCH_TENDERS} files allowed")
+
+        for f in pdf_files:
+            if not f.filename.lower().endswith('.pdf'):
+                raise HTTPException(status_code=400, detail=f"Invalid file: {f.filename}")
+
+        summaries = await process_tenders_batched([[f] for f in pdf_files])
+
+        results = []
+        for summary in summaries:
+            portal_type = summary.get("_metadata", {}).get("portal_type", "Generic")
+            formatted_summary = format_response_by_portal(summary, portal_type)
+            results.append({
+                "tender_id": formatted_summary.get("tender_meta", {}).get("tender_id", ""),
+                "summary": formatted_summary,
+                "metadata": formatted_summary.get("_metadata", {}),
+            })
+
+        return {
+            "status": "success",
+            "results": results,
+            "message": f"{len(results)} tender(s) processed and summarized successfully"
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch process failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -13,9 +13,12 @@ load_dotenv()
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from app.api.tender import router as tender_router
+from app.services.pdf_extractor import close_http_client
+from app.services.cpu_pool import start_cpu_pool, shutdown_cpu_pool
+from app.services.summarizer import warm_prompt_templates
 
 # Configure logging
 logging.basicConfig(
@@ -28,7 +31,11 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handles startup and shutdown events."""
+    start_cpu_pool()
+    await warm_prompt_templates()
     yield
+    await close_http_client()
+    shutdown_cpu_pool()
 
 
 # Create FastAPI application
@@ -41,6 +48,7 @@ app = FastAPI(
     """,
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
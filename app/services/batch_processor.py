@@ -6,7 +6,10 @@ Handles chunking, micro-summarization, and merging for large PDFs that exceed LL
 import asyncio
 import logging
 from typing import List, Dict, Any
-from app.services.groq_client import call_groq_with_retry, validate_json_response, estimate_tokens, rate_limiter
+from app.services.groq_client import (
+    call_groq_with_retry, validate_json_response, estimate_tokens, rate_limiter, to_prompt_json,
+    GROQ_CONCURRENCY
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,23 +22,24 @@ CHUNK:
 {text}
 """
 
+# Invariant instructions and schema come first so every merge call shares a cacheable prefix
 FINAL_MERGE_PROMPT = """You are a tender analyst. Below are micro-summaries of various parts of a tender document along with some pre-extracted structured fields.
 Your task is to create a SINGLE, COMPLETE, and ACCURATE JSON summary following the EXACT schema provided.
 
-PRE-EXTRACTED DATA:
-{pre_extracted}
-
-MICRO-SUMMARIES:
-{summaries}
-
-OUTPUT SCHEMA:
-{schema}
-
 DIRECTIONS:
 1. Merge all information into a single coherent summary.
 2. If there are conflicting values, prefer the most recent or specific one.
 3. If information is missing, use empty strings/lists as per schema.
 4. Output ONLY valid JSON.
+
+OUTPUT SCHEMA:
+{schema}
+
+PRE-EXTRACTED DATA:
+{pre_extracted}
+
+MICRO-SUMMARIES:
+{summaries}
 """
 
 def filter_relevant_lines(text: str) -> str:
@@ -93,12 +97,34 @@ async def process_micro_batch(chunk: str) -> str:
 
     prompt = MICRO_SUMMARY_PROMPT.format(text=chunk)
     res = await call_groq_with_retry(prompt)
+    return _micro_summary_text(res)
+
+def _micro_summary_text(res: str) -> str:
+    """Normalize a micro-summary response: parsed JSON when valid, otherwise the raw text."""
     try:
         data = validate_json_response(res)
         return str(data)
     except:
         return res
 
+async def summarize_chunks(chunks: List[str]) -> List[str]:
+    """
+    Micro-summarize chunks concurrently, with at most GROQ_CONCURRENCY calls in flight.
+
+    Args:
+        chunks (List[str]): Text chunks.
+
+    Returns:
+        List[str]: Micro-summary of each chunk, in order.
+    """
+    sem = asyncio.Semaphore(GROQ_CONCURRENCY)
+
+    async def bounded(chunk: str) -> str:
+        async with sem:
+            return await process_micro_batch(chunk)
+
+    return await asyncio.gather(*(bounded(c) for c in chunks))
+
 async def process_large_document(text: str, pre_extracted: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
     """
     Orchestrate the processing of a large document.
@@ -119,14 +145,13 @@ async def process_large_document(text: str, pre_extracted: Dict[str, Any], schem
 
     logger.info(f"Processing large document in {len(chunks)} chunks")
 
-    tasks = [process_micro_batch(c) for c in chunks]
-    summaries = await asyncio.gather(*tasks)
+    summaries = await summarize_chunks(chunks)
 
     # Second Pass: Merge and structure
     merge_prompt = FINAL_MERGE_PROMPT.format(
-        pre_extracted=pre_extracted,
+        pre_extracted=to_prompt_json(pre_extracted),
         summaries="\n\n".join([f"--- CHUNK {i+1} ---\n{s}" for i, s in enumerate(summaries)]),
-        schema=schema
+        schema=to_prompt_json(schema)
     )
 
     tokens = estimate_tokens(merge_prompt)
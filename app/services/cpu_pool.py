@@ -0,0 +1,71 @@
+"""
+CPU Pool Service
+Runs CPU-bound PDF parsing and regex extraction in worker processes, outside the GIL.
+Falls back to threads where process pools are unavailable (e.g. serverless runtimes).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Worker process count; 0 disables the pool and keeps all CPU work in threads
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(os.cpu_count() or 1)))
+
+# Shared pool (created at application startup, shut down with it)
+_POOL: Optional[ProcessPoolExecutor] = None
+
+def start_cpu_pool() -> None:
+    """Create the shared process pool. Called on application startup."""
+    global _POOL
+    if _POOL is not None or CPU_WORKERS <= 0:
+        return
+    try:
+        # Spawned workers do not inherit the server's threads or locks, unlike forked ones
+        _POOL = ProcessPoolExecutor(max_workers=CPU_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        logger.info(f"Started CPU pool with {CPU_WORKERS} worker processes")
+    except (OSError, NotImplementedError) as e:
+        logger.warning(f"Process pool unavailable, running CPU-bound work in threads: {str(e)}")
+
+def shutdown_cpu_pool() -> None:
+    """Shut down the shared process pool. Called on application shutdown."""
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(cancel_futures=True)
+        _POOL = None
+
+async def run_cpu_bound(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a module-level function in the process pool, or in a thread when no pool is running.
+    Arguments and results must be picklable.
+
+    Args:
+        func (Callable[..., Any]): Function to run.
+        *args (Any): Positional arguments for func.
+
+    Returns:
+        Any: The function's result.
+
+    Raises:
+        BrokenProcessPool: If the worker died while running func; the pool is restarted.
+    """
+    global _POOL
+    pool = _POOL
+    if pool is None:
+        return await asyncio.to_thread(func, *args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. a crashing PDF); the input is not retried in-process, but a
+        # broken pool rejects every later call, so it is replaced
+        logger.error("CPU pool worker died, restarting the pool")
+        if _POOL is pool:
+            _POOL = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            start_cpu_pool()
+        raise
@@ -5,6 +5,7 @@ Handles extraction for GeM-specific fields and pre-qualification tables.
 
 import re
 import logging
+import regex
 from typing import Dict, Optional, List
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,39 @@ GEM_PATTERNS = {
     "epbg_duration": r"ePBG.*?Duration\s*[:\-]?\s*(\d+\s*(?:days?|weeks?|months?))",
 }
 
+# Pre-qualification table patterns (English, Hindi), compiled once at import.
+# Built with the regex module: possessive quantifiers never backtrack into whitespace or digit runs.
+# A value must start within 500 chars of its header so each header occurrence scans a bounded window
+_RAW_PQ_PATTERNS = {
+    "turnover": [
+        r"Minimum\s++Average\s++Annual\s++Turnover\s++of\s++the\s++bidder.{0,500}?\n\s*+([\d,]++)\s*+(?:Lakh|Crore|LAKH|CRORE)?\s*+\(s\)?",
+        r"बिडर का न्यूनतम औसत वार्षिक टर्नओवर.{0,500}?\n\s*+([\d,]++)\s*+(?:लाख|करोड़|Lakh|Crore)?\s*+\(s\)?",
+    ],
+    "oem": [
+        r"OEM\s++Average\s++Turnover.{0,500}?\n\s*+([\d,]++)\s*+(?:Lakh|Crore|LAKH|CRORE)?\s*+\(s\)?",
+        r"मूल उपकरण निर्माता का औसत टर्नओवर.{0,500}?\n\s*+([\d,]++)\s*+(?:लाख|करोड़|Lakh|Crore)?\s*+\(s\)?",
+    ],
+    "exp": [
+        r"Years?\s++of\s++Past\s++Experience\s++Required.{0,500}?\n\s*+(\d++)\s*+Year\s*+\(s\)?",
+        r"समान सेवा के लिए अपेक्षित विगत अनुभव के वर्ष.{0,500}?\n\s*+(\d++)\s*+Year\s*+\(s\)?",
+    ],
+    "mse": [
+        r"MSE\s++Relaxation\s++for\s++Years.{0,500}?\n\s*+(Yes|No|Complete|Partial|Exempt)\s*+\|\s*+(Complete|Partial|Exempt)?",
+        r"एमएसएमई को छूट.{0,500}?\n\s*+(Yes|No|हाँ|नहीं|Complete|Partial|Exempt)",
+    ],
+    "startup": [
+        r"Startup\s++Relaxation\s++for\s++Years.{0,500}?\n\s*+(Yes|No|Complete|Partial|Exempt)\s*+\|\s*+(Complete|Partial|Exempt)?",
+        r"स्टार्टअप के लिए छूट.{0,500}?\n\s*+(Yes|No|हाँ|नहीं|Complete|Partial|Exempt)",
+    ],
+    "doc": [
+        r"Document\s++required\s++from\s++seller\s*\n\s*+(.*?)(?:\n\s*+\*|$)",
+        r"विक्रेता से मांगे गए दस्तावेज़\s*\n\s*+(.*?)(?:\n\s*+\*|$)",
+    ],
+}
+_PQ_PATTERNS = {
+    k: [regex.compile(p, regex.IGNORECASE | regex.DOTALL) for p in pats] for k, pats in _RAW_PQ_PATTERNS.items()
+}
+
 def extract_gem_tender_id(text: str) -> Optional[str]:
     """
     Extract GeM-specific tender ID format (GEM/YYYY/X/NNNN).
@@ -107,45 +141,29 @@ def extract_gem_pre_qualification_table(text: str) -> Dict[str, any]:
     result = {}
 
     # turnover
-    turnover_patterns = [
-        r"Minimum\s+Average\s+Annual\s+Turnover\s+of\s+the\s+bidder.*?\n\s*([\d,]+)\s*(?:Lakh|Crore|LAKH|CRORE)?\s*\(s\)?",
-        r"बिडर का न्यूनतम औसत वार्षिक टर्नओवर.*?\n\s*([\d,]+)\s*(?:लाख|करोड़|Lakh|Crore)?\s*\(s\)?",
-    ]
-    for pattern in turnover_patterns:
-        turnover_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+    for pattern in _PQ_PATTERNS["turnover"]:
+        turnover_match = pattern.search(text)
         if turnover_match:
             result["turnover_requirement"] = f"₹{turnover_match.group(1)} Lakh(s)"
             break
 
     # OEM turnover
-    oem_patterns = [
-        r"OEM\s+Average\s+Turnover.*?\n\s*([\d,]+)\s*(?:Lakh|Crore|LAKH|CRORE)?\s*\(s\)?",
-        r"मूल उपकरण निर्माता का औसत टर्नओवर.*?\n\s*([\d,]+)\s*(?:लाख|करोड़|Lakh|Crore)?\s*\(s\)?",
-    ]
-    for pattern in oem_patterns:
-        oem_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+    for pattern in _PQ_PATTERNS["oem"]:
+        oem_match = pattern.search(text)
         if oem_match:
             result["oem_turnover_requirement"] = f"₹{oem_match.group(1)} Lakh(s)"
             break
 
     # Experience
-    exp_patterns = [
-        r"Years?\s+of\s+Past\s+Experience\s+Required.*?\n\s*(\d+)\s*Year\s*\(s\)?",
-        r"समान सेवा के लिए अपेक्षित विगत अनुभव के वर्ष.*?\n\s*(\d+)\s*Year\s*\(s\)?",
-    ]
-    for pattern in exp_patterns:
-        exp_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+    for pattern in _PQ_PATTERNS["exp"]:
+        exp_match = pattern.search(text)
         if exp_match:
             result["experience_required"] = f"{exp_match.group(1)} Year(s)"
             break
 
     # MSE relaxation
-    mse_patterns = [
-        r"MSE\s+Relaxation\s+for\s+Years.*?\n\s*(Yes|No|Complete|Partial|Exempt)\s*\|\s*(Complete|Partial|Exempt)?" ,
-        r"एमएसएमई को छूट.*?\n\s*(Yes|No|हाँ|नहीं|Complete|Partial|Exempt).*?(?:\||$)",
-    ]
-    for pattern in mse_patterns:
-        mse_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+    for pattern in _PQ_PATTERNS["mse"]:
+        mse_match = pattern.search(text)
         if mse_match:
             val1 = mse_match.group(1) or ""
             val2 = mse_match.group(2) or "" if mse_match.lastindex and mse_match.lastindex >= 2 else ""
@@ -153,12 +171,8 @@ def extract_gem_pre_qualification_table(text: str) -> Dict[str, any]:
             break
 
     # Startup relaxation
-    startup_patterns = [
-        r"Startup\s+Relaxation\s+for\s+Years.*?\n\s*(Yes|No|Complete|Partial|Exempt)\s*\|\s*(Complete|Partial|Exempt)?",
-        r"स्टार्टअप के लिए छूट.*?\n\s*(Yes|No|हाँ|नहीं|Complete|Partial|Exempt).*?(?:\||$)",
-    ]
-    for pattern in startup_patterns:
-        startup_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+    for pattern in _PQ_PATTERNS["startup"]:
+        startup_match = pattern.search(text)
         if startup_match:
             val1 = startup_match.group(1) or ""
             val2 = startup_match.group(2) or "" if startup_match.lastindex and startup_match.lastindex >= 2 else ""
@@ -166,12 +180,8 @@ def extract_gem_pre_qualification_table(text: str) -> Dict[str, any]:
             break
 
     # Documents required
-    doc_patterns = [
-        r"Document\s+required\s+from\s+seller\s*\n\s*(.*?)(?:\n\s*\*|$)",
-        r"विक्रेता से मांगे गए दस्तावेज़\s*\n\s*(.*?)(?:\n\s*\*|$)",
-    ]
-    for pattern in doc_patterns:
-        docs_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+    for pattern in _PQ_PATTERNS["doc"]:
+        docs_match = pattern.search(text)
         if docs_match:
             docs_text = docs_match.group(1).strip()
             docs = [d.strip() for d in re.split(r'[,•\n]', docs_text) if d.strip() and len(d.strip()) > 2]
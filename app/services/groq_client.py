@@ -6,11 +6,13 @@ Handles asynchronous communication with Groq LPUs with rate limiting and retries
 import os
 import json
 import logging
+import orjson
 import time
 import asyncio
 import random
 import re
 from typing import Optional, Dict
+import httpx
 from groq import AsyncGroq
 
 logger = logging.getLogger(__name__)
@@ -22,6 +24,13 @@ async_client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
 MODEL_NAME = "openai/gpt-oss-120b"
 TPM_LIMIT = 1000000
 RPM_LIMIT = 3000
+# Completion tokens reserved for one tender summary, and the most one call may request
+MAX_OUTPUT_TOKENS = 6000
+MAX_COMPLETION_TOKENS = 32768
+# Maximum concurrent real-time calls per large document (micro-summaries)
+GROQ_CONCURRENCY = max(1, int(os.getenv("GROQ_CONCURRENCY", "4")))
+SYSTEM_PROMPT = "You are a tender analyst. Output valid JSON only. Escape all newlines and quotes within string values."
+
 
 class TokenBucket:
     """Token bucket for thread-safe rate limiting."""
@@ -41,6 +50,13 @@ class TokenBucket:
                 return True
             return False
 
+    async def clamp(self, available: float):
+        """Lower the bucket to a server-reported remaining capacity, never raising it."""
+        async with self.lock:
+            now = time.time()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate, available)
+            self.last_refill = now
+
     async def wait_for(self, amount: float):
         """Wait until enough tokens are available."""
         check = min(amount, self.capacity)
@@ -60,11 +76,35 @@ class GroqRateLimiter:
         await self.rpm.wait_for(1)
         await self.tpm.wait_for(prompt_tokens)
 
+    async def observe(self, headers: httpx.Headers):
+        """
+        Sync the TPM bucket with Groq's x-ratelimit-remaining-tokens header, so calls slow down
+        when other clients share the key. The requests header counts per day, so RPM stays local.
+        """
+        remaining = headers.get("x-ratelimit-remaining-tokens")
+        if remaining and remaining.isdigit():
+            await self.tpm.clamp(int(remaining))
+
 rate_limiter = GroqRateLimiter()
 
+def to_prompt_json(data) -> str:
+    """
+    Serialize data as 2-space indented JSON for prompt injection, using orjson.
+    Non-ASCII text (e.g. ₹, Hindi) is kept as is rather than \\u-escaped, which also saves tokens.
+    Keys are sorted so equal data always yields byte-identical prompt text.
+
+    Args:
+        data: JSON-compatible object with string keys.
+
+    Returns:
+        str: Indented JSON text.
+    """
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode("utf-8")
+
 def estimate_tokens(text: str) -> int:
     """
-    Roughly estimate token count based on string length.
+    Roughly estimate token count based on string length (~4 chars per token).
+    Constant time: only the cached length is read, the text itself is never scanned.
 
     Args:
         text (str): Input text.
@@ -74,7 +114,18 @@ def estimate_tokens(text: str) -> int:
     """
     return len(text) // 4
 
-async def call_groq(prompt: str, model: str = None, temp: float = 0.0) -> str:
+def _chat_request(prompt: str, model: str = None, temp: float = 0.0, max_tokens: int = MAX_OUTPUT_TOKENS) -> Dict:
+    """Build the chat completion request body sent by call_groq."""
+    return {
+        "model": model or MODEL_NAME, "temperature": temp, "max_tokens": max_tokens,
+        "response_format": {"type": "json_object"},
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    }
+
+async def call_groq(prompt: str, model: str = None, temp: float = 0.0, max_tokens: int = MAX_OUTPUT_TOKENS) -> str:
     """
     Single asynchronous call to Groq API.
 
@@ -82,26 +133,24 @@ async def call_groq(prompt: str, model: str = None, temp: float = 0.0) -> str:
         prompt (str): Prompt to send.
         model (str, optional): Model override.
         temp (float): Temperature setting.
+        max_tokens (int): Completion token limit.
 
     Returns:
         str: Raw response content.
     """
     try:
-        target = model or MODEL_NAME
-        res = await async_client.chat.completions.create(
-            model=target, temperature=temp, max_tokens=6000,
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "You are a tender analyst. Output valid JSON only. Escape all newlines and quotes within string values."},
-                {"role": "user", "content": prompt}
-            ]
+        raw = await async_client.chat.completions.with_raw_response.create(
+            **_chat_request(prompt, model, temp, max_tokens)
         )
+        await rate_limiter.observe(raw.headers)
+        res = await raw.parse()
         return res.choices[0].message.content
     except Exception as e:
         logger.error(f"Groq API call failed: {str(e)}")
         raise
 
-async def call_groq_with_retry(prompt: str, model: str = None, retries: int = 5) -> str:
+async def call_groq_with_retry(prompt: str, model: str = None, retries: int = 5,
+                               max_tokens: int = MAX_OUTPUT_TOKENS) -> str:
     """
     Call Groq API with exponential backoff and retries.
 
@@ -109,13 +158,14 @@ async def call_groq_with_retry(prompt: str, model: str = None, retries: int = 5)
         prompt (str): Prompt to send.
         model (str, optional): Model override.
         retries (int): Number of retries.
+        max_tokens (int): Completion token limit.
 
     Returns:
         str: Raw response content.
     """
     for i in range(retries):
         try:
-            return await call_groq(prompt, model)
+            return await call_groq(prompt, model, max_tokens=max_tokens)
         except Exception as e:
             if i == retries - 1: raise
             wait = (2 ** (i + 1)) + random.uniform(0, 1)
@@ -144,6 +194,7 @@ def validate_json_response(response: str) -> dict:
             clean = clean.split("```")[1].split("```")[0]
 
         clean = clean.strip()
+        # The stdlib parser keeps integers exact and accepts NaN/Infinity, unlike orjson
         return json.loads(clean)
     except json.JSONDecodeError:
         try:
@@ -6,39 +6,193 @@ Uses PyMuPDF (fitz) for high-performance text and hyperlink extraction.
 import fitz
 import httpx
 import logging
-from typing import Tuple, List
+from fastapi import UploadFile
+from typing import Tuple, List, Optional
+from app.services.cpu_pool import run_cpu_bound
 
 logger = logging.getLogger(__name__)
 
-async def extract_text_and_links(pdf_bytes: bytes) -> Tuple[str, List[str]]:
+# Shared HTTP client (lazily created, reused across requests for connection pooling)
+_CLIENT: Optional[httpx.AsyncClient] = None
+HTTP_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+MAX_PDF_SIZE = 50 * 1024 * 1024  # 50 MB cap per external PDF
+STREAM_CHUNK_SIZE = 64 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_PAGES = 500
+EXTERNAL_MAX_PAGES = 200  # External PDFs are supplementary
+# Content types accepted for external PDFs (many servers send PDFs as octet-stream)
+PDF_CONTENT_TYPES = ("pdf", "octet-stream")
+
+def _get_client(timeout: int) -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            timeout=timeout, follow_redirects=True, http2=True, limits=HTTP_LIMITS
+        )
+    return _CLIENT
+
+async def close_http_client():
+    """Close the shared AsyncClient. Called on application shutdown."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+def _is_pdf_uri(uri: str) -> bool:
+    """Check for a .pdf path suffix, ignoring any query string or fragment."""
+    base = uri.split("?", 1)[0].split("#", 1)[0]
+    return base.endswith((".pdf", ".PDF")) or base[-4:].lower() == ".pdf"
+
+async def read_upload(upload: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> bytearray:
+    """
+    Read an uploaded file in chunks into a single pre-sized buffer.
+    Spooled-to-disk uploads are read one chunk per threadpool call, so the event loop
+    is never held for a whole-file copy.
+
+    Args:
+        upload (UploadFile): Uploaded file.
+        chunk_size (int): Bytes read per call.
+
+    Returns:
+        bytearray: The file content (passed to fitz without copying).
+    """
+    total = upload.size or 0
+    buf = bytearray(total) if total else bytearray()
+    offset = 0
+    while chunk := await upload.read(chunk_size):
+        end = offset + len(chunk)
+        if end <= total:
+            buf[offset:end] = chunk
+        else:
+            # Size missing or inaccurate, grow the buffer
+            del buf[offset:]
+            buf.extend(chunk)
+        offset = end
+    del buf[offset:]
+    return buf
+
+async def extract_text_and_links(
+    pdf_bytes: bytes, *, collect_links: bool = True, max_pages: Optional[int] = MAX_PAGES
+) -> Tuple[str, List[str]]:
     """
     Extract raw text and external PDF hyperlinks from PDF content.
 
     Args:
         pdf_bytes (bytes): The binary content of the PDF file.
+        collect_links (bool): Whether to enumerate page links. Pass False when only text is needed.
+        max_pages (Optional[int]): Maximum number of pages to parse. None parses every page.
 
     Returns:
         Tuple[str, List[str]]: A tuple containing (combined_text, list_of_pdf_links).
     """
     try:
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        text_pages, pdf_links = [], []
+        # Parsing is CPU-bound; run it in a worker process (or thread) off the event loop.
+        # Each call owns its own Document, as fitz objects must not be shared across threads.
+        return await run_cpu_bound(_extract_sync, pdf_bytes, collect_links, max_pages)
+    except Exception as e:
+        logger.error(f"PDF extraction failed: {str(e)}")
+        raise
+
+def _extract_sync(
+    pdf_bytes: bytes, collect_links: bool, max_pages: Optional[int]
+) -> Tuple[str, List[str]]:
+    """Synchronous page loop behind extract_text_and_links."""
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        text_pages, pdf_links = [], set()
 
-        for page_num, page in enumerate(doc, start=1):
-            text = page.get_text()
+        total_pages = len(doc)
+        page_count = min(total_pages, max_pages or total_pages)
+        if page_count < total_pages:
+            logger.info(f"Truncated at {page_count} of {total_pages} pages")
+
+        for i in range(page_count):
+            page = doc.load_page(i)
+            # Build the textpage once explicitly; same flags as page.get_text("text")
+            tp = page.get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+            text = tp.extractText()
+            del tp
             if text.strip():
-                text_pages.append(f"--- Page {page_num} ---\n{text}")
+                text_pages.append(f"--- Page {i + 1} ---\n{text}")
 
-            for link in page.get_links():
-                uri = link.get("uri", "")
-                if uri and uri.lower().endswith(".pdf"):
-                    pdf_links.append(uri)
+            if collect_links:
+                # Generator over URI links only, no full link list materialization
+                for link in page.links(kinds=(fitz.LINK_URI,)):
+                    uri = link.get("uri")
+                    if uri and _is_pdf_uri(uri):
+                        pdf_links.add(uri)
 
+        return "\n\n".join(text_pages), list(pdf_links)
+    finally:
         doc.close()
-        return "\n\n".join(text_pages), list(set(pdf_links))
-    except Exception as e:
-        logger.error(f"PDF extraction failed: {str(e)}")
-        raise
+
+def _is_acceptable_response(headers: httpx.Headers) -> Tuple[bool, str]:
+    """
+    Check response headers for a PDF-compatible content type and allowed size.
+
+    Returns:
+        Tuple[bool, str]: (acceptable, reason when not acceptable).
+    """
+    content_type = headers.get("content-type", "").lower()
+    if content_type and not any(t in content_type for t in PDF_CONTENT_TYPES):
+        return False, f"unexpected content-type '{content_type}'"
+    size = int(headers.get("content-length") or 0)
+    if size > MAX_PDF_SIZE:
+        return False, f"PDF too large ({size} bytes)"
+    return True, ""
+
+async def _preflight(client: httpx.AsyncClient, url: str, timeout: int) -> Tuple[bool, str]:
+    """
+    Issue a HEAD request to reject non-PDF or oversized URLs before downloading.
+    Servers that do not support HEAD are allowed through to the streaming GET,
+    which re-checks the headers and enforces the size cap mid-stream.
+    """
+    try:
+        head = await client.head(url, timeout=timeout)
+    except httpx.HTTPError:
+        return True, ""
+    if head.is_error:
+        return True, ""
+    return _is_acceptable_response(head.headers)
+
+async def _download_pdf(client: httpx.AsyncClient, url: str, timeout: int) -> bytearray:
+    """
+    Stream a remote PDF into a single pre-sized buffer, enforcing MAX_PDF_SIZE.
+
+    Args:
+        client (httpx.AsyncClient): Shared HTTP client.
+        url (str): PDF URL.
+        timeout (int): Request timeout in seconds.
+
+    Returns:
+        bytearray: The downloaded PDF content (passed to fitz without copying).
+
+    Raises:
+        ValueError: If the body is not a PDF or exceeds MAX_PDF_SIZE.
+    """
+    async with client.stream("GET", url, timeout=timeout) as res:
+        res.raise_for_status()
+        ok, reason = _is_acceptable_response(res.headers)
+        if not ok:
+            raise ValueError(reason)
+        total = int(res.headers.get("content-length") or 0)
+
+        buf = bytearray(total) if total else bytearray()
+        offset = 0
+        async for chunk in res.aiter_bytes(STREAM_CHUNK_SIZE):
+            end = offset + len(chunk)
+            if end > MAX_PDF_SIZE:
+                raise ValueError(f"PDF exceeded {MAX_PDF_SIZE} bytes while streaming")
+            if end <= total:
+                buf[offset:end] = chunk
+            else:
+                # Content-Length missing or inaccurate, grow the buffer
+                del buf[offset:]
+                buf.extend(chunk)
+            offset = end
+        del buf[offset:]
+        return buf
 
 async def fetch_external_pdfs(links: List[str], timeout: int = 15) -> List[str]:
     """
@@ -52,16 +206,18 @@ async def fetch_external_pdfs(links: List[str], timeout: int = 15) -> List[str]:
         List[str]: List of extracted text blocks from each external PDF.
     """
     extracted = []
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-        for url in links:
-            try:
-                res = await client.get(url)
-                res.raise_for_status()
-                text, _ = await extract_text_and_links(res.content)
-                extracted.append(f"\n\n=== External PDF: {url} ===\n{text}")
-            except Exception as e:
-                logger.warning(f"Failed to fetch {url}: {str(e)}")
+    client = _get_client(timeout)
+    for url in links:
+        try:
+            ok, reason = await _preflight(client, url, timeout)
+            if not ok:
+                logger.warning(f"Skipping {url}: {reason}")
+                continue
+            pdf_bytes = await _download_pdf(client, url, timeout)
+            text, _ = await extract_text_and_links(
+                pdf_bytes, collect_links=False, max_pages=EXTERNAL_MAX_PAGES
+            )
+            extracted.append(f"\n\n=== External PDF: {url} ===\n{text}")
+        except Exception as e:
+            logger.warning(f"Failed to fetch {url}: {str(e)}")
     return extracted
-
-
-
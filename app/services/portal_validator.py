@@ -5,6 +5,8 @@ Provides warnings and errors for missing critical fields.
 """
 
 import logging
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, List, Any
 
 logger = logging.getLogger(__name__)
@@ -26,7 +28,19 @@ CPPP_REQUIRED_FIELDS = {
     "root": ["online_submission_documents"]
 }
 
+# Generic critical fields as (label, section getter, field getter), built once at import
+GENERIC_CRITICAL_FIELDS = [
+    (f"{section}.{field}", itemgetter(section), itemgetter(field))
+    for section, field in [
+        ("tender_meta", "tender_id"),
+        ("tender_meta", "tender_title"),
+        ("key_dates", "bid_end"),
+        ("financial_requirements", "emd"),
+    ]
+]
+
 EMPTY_INDICATORS = ["not found", "not mentioned", "not specified", "n/a", "", None]
+_EMPTY_STR = frozenset(i for i in EMPTY_INDICATORS if isinstance(i, str))
 
 def is_field_empty(value: Any) -> bool:
     """
@@ -41,11 +55,17 @@ def is_field_empty(value: Any) -> bool:
     if value is None:
         return True
     if isinstance(value, str):
-        return value.lower().strip() in EMPTY_INDICATORS
+        return _is_empty_str(value)
     if isinstance(value, (list, dict)):
-        return len(value) == 0
+        return not value
     return False
 
+@lru_cache(maxsize=1024)
+def _is_empty_str(value: str) -> bool:
+    """Memoized string check; the same sentinel values recur across validations."""
+    stripped = value.strip()
+    return not stripped or stripped.lower() in _EMPTY_STR
+
 def validate_gem_fields(data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate GeM-specific fields are present and populated."""
     result = {"is_valid": True, "missing_fields": [], "warnings": []}
@@ -54,7 +74,7 @@ def validate_gem_fields(data: Dict[str, Any]) -> Dict[str, Any]:
         section_data = data if section == "root" else data.get(section, {})
         # Ensure section_data is a dict before calling .get()
         if not isinstance(section_data, dict):
-            logger.warning(f"Validation: Section {section} is not a dict: {type(section_data)}")
+            logger.warning("Validation: Section %s is not a dict: %s", section, type(section_data))
             section_data = {}
 
         for field in fields:
@@ -99,19 +119,15 @@ def validate_generic_fields(data: Dict[str, Any]) -> Dict[str, Any]:
         Dict[str, Any]: Validation results.
     """
     result = {"is_valid": True, "missing_fields": [], "warnings": []}
-    critical_fields = [
-        ("tender_meta", "tender_id"),
-        ("tender_meta", "tender_title"),
-        ("key_dates", "bid_end"),
-        ("financial_requirements", "emd"),
-    ]
 
-    for section, field in critical_fields:
-        section_data = data.get(section, {})
-        if not isinstance(section_data, dict):
-            section_data = {}
-        if is_field_empty(section_data.get(field)):
-            result["missing_fields"].append(f"{section}.{field}")
+    for label, get_section, get_field in GENERIC_CRITICAL_FIELDS:
+        try:
+            value = get_field(get_section(data))
+        except (KeyError, TypeError, IndexError):
+            # Missing section/field or a section that is not a dict
+            value = None
+        if is_field_empty(value):
+            result["missing_fields"].append(label)
             result["is_valid"] = False
     return result
 
@@ -119,7 +135,7 @@ def validate_extraction_completeness(data: Any, portal_type: str) -> Dict[str, A
     """Route to portal-specific validation and perform final assembly."""
     # Safety check: ensure data is a dict
     if not isinstance(data, dict):
-        logger.error(f"Validation failed: Data is not a dictionary but {type(data)}")
+        logger.error("Validation failed: Data is not a dictionary but %s", type(data))
         return {
             "is_valid": False,
             "missing_fields": ["root"],
@@ -128,7 +144,7 @@ def validate_extraction_completeness(data: Any, portal_type: str) -> Dict[str, A
             "validation_summary": {"total_issues": 1, "missing_fields_count": 1, "warnings_count": 0}
         }
 
-    logger.info(f"Validating {portal_type} portal extraction")
+    logger.info("Validating %s portal extraction", portal_type)
 
     if portal_type == "GeM":
         validation = validate_gem_fields(data)
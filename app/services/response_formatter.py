@@ -112,6 +112,6 @@ def format_response_by_portal(tender_data: Dict[str, Any], portal_type: str) ->
     Returns:
         Dict[str, Any]: Formatted data.
     """
-    logger.info(f"Formatting response for {portal_type} portal")
+    logger.debug("Formatting response for %s portal", portal_type)
     # All portals currently use the standard transformation
     return format_tender_response(tender_data)
@@ -1,20 +1,29 @@
 """
 Rule-Based Field Extraction
 Uses regex patterns to extract structured fields BEFORE LLM processing.
+Base fields are found in a single compiled RE2 (DFA, no backtracking) pass over the UTF-8 text.
 """
 
 import re
+import copy
+import inspect
 import logging
-from typing import Dict, Optional, List
+import threading
+from collections import OrderedDict
+from functools import wraps
+import ahocorasick
+import re2
+import xxhash
+from typing import Any, Dict, Optional, List, Tuple, Union
 from app.services.gem_rules import extract_gem_fields
 from app.services.cppp_rules import extract_cppp_fields
 
 logger = logging.getLogger(__name__)
 
 # Regex Patterns for Common Tender Fields
-PATTERNS = {
+_RAW_PATTERNS = {
     "tender_id_gem": r"GEM/\d{4}/[A-Z]/\d+",
-    "tender_id_generic": r"(?:Tender\s+(?:No|ID|Reference)|Ref(?:\.?\s*No)?|NIT\s*(?:No|ID|Ref)?|Solicitation\s+No)[\s:]+\s*([A-Z0-9\-_/]{4,})",
+    "tender_id_generic": r"(?:Tender\s+(?:No|ID|Reference)|Ref(?:\.?\s*No)?|NIT\s*(?:No|ID|Ref)?|Solicitation\s+No)[\s:]+([A-Z0-9\-_/]{4,})",
     "emd_amount": r"(?:EMD|Earnest\s+Money(?:\s+Deposit)?)\s*[:\-]?\s*₹?\s*(?:Rs\.?)?\s*([\d,]+(?:\.\d{2})?)\s*(?:Lakhs?|Crores?|/-)?",
     "tender_fee": r"(?:Tender\s+(?:Fee|Document\s+Fee))\s*[:\-]?\s*₹?\s*(?:Rs\.?)?\s*([\d,]+(?:\.\d{2})?)",
     "performance_security": r"(?:Performance\s+(?:Security|Bank\s+Guarantee|Guarantee))\s*[:\-]?\s*(\d+%|\d+\s*%|₹\s*[\d,]+)",
@@ -36,6 +45,189 @@ PATTERNS = {
     "consortium_allowed": r"(?:Consortium|Joint\s+Venture|JV)\s+(?:is\s+)?(?:allowed|permitted|not\s+allowed|not\s+permitted)",
 }
 
+# Compiled once at import; callers use pattern.search() directly
+PATTERNS = {k: re.compile(v, re.IGNORECASE) for k, v in _RAW_PATTERNS.items()}
+
+# Both date formats in one pass; their matches can never overlap, so this finds the union
+_DATES_RE = re.compile(
+    f"(?:{_RAW_PATTERNS['date_dd_mm_yyyy']})|(?:{_RAW_PATTERNS['date_dd_mmm_yyyy']})", re.IGNORECASE
+)
+
+def _utf8(text: str) -> bytes:
+    """Return the UTF-8 encoding of text, passing through lone surrogates from PDF extraction."""
+    return text.encode("utf-8", "surrogatepass")
+
+# Fields resolved by _extract_base_fields, scanned together in a single RE2 pass
+BASE_FIELD_KEYS = [
+    "tender_id_gem", "tender_id_generic", "emd_amount", "tender_fee",
+    "bid_start_date", "bid_end_date", "tech_opening", "financial_opening",
+    "bid_validity_period", "turnover", "experience_years", "similar_projects",
+    "msme_exemption", "startup_exemption",
+]
+
+# RE2's \s and \d are ASCII-only; Python's str versions are Unicode-aware (e.g. NBSP in PDF text)
+_RE2_SPACE = r"\s\x{0b}\x{1c}-\x{1f}\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}"
+
+# Python's IGNORECASE also matches dotted and dotless I (İ, ı) for i; RE2's (?i) case folding does not
+_RE2_EXTRA_I = r"\x{130}\x{131}"
+
+def _to_re2(raw: str) -> str:
+    """
+    Translate a Python pattern to RE2 syntax, keeping Python's Unicode \\s and \\d semantics
+    and its case-insensitive matching of İ and ı wherever the pattern can match an i.
+    """
+    out, i, in_class, class_start = [], 0, False, 0
+    while i < len(raw):
+        c = raw[i]
+        if c == "\\":
+            esc = raw[i:i + 2]
+            if esc == r"\s":
+                out.append(_RE2_SPACE if in_class else f"[{_RE2_SPACE}]")
+            elif esc == r"\d":
+                out.append(r"\p{Nd}")
+            else:
+                out.append(esc)
+            i += 2
+            continue
+        if c == "[" and not in_class:
+            in_class, class_start = True, i
+        elif c == "]" and in_class:
+            in_class = False
+            cls = raw[class_start:i + 1]
+            if not cls.startswith("[^") and re.fullmatch(cls, "i", re.IGNORECASE):
+                out.append(_RE2_EXTRA_I)
+        elif c in "iI" and not in_class:
+            out.append(f"[iI{_RE2_EXTRA_I}]")
+            i += 1
+            continue
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+def _build_fused_pattern(keys: List[str]) -> Tuple[Any, Dict[int, Tuple[str, int]]]:
+    """
+    Join raw patterns into one RE2 alternation of named groups.
+
+    Returns:
+        Tuple[Any, Dict[int, Tuple[str, int]]]: The compiled RE2 pattern and a map from each
+        alternative's outer group index to (key, index of the group holding its value).
+    """
+    parts, groups, group_idx = [], {}, 0
+    for key in keys:
+        raw = _RAW_PATTERNS[key]
+        inner = re.compile(raw).groups
+        group_idx += 1
+        groups[group_idx] = (key, group_idx + 1 if inner else group_idx)
+        group_idx += inner
+        parts.append(f"(?P<{key}>{_to_re2(raw)})")
+    return re2.compile("(?i)" + "|".join(parts)), groups
+
+_BASE_FIELDS_RE, _BASE_FIELD_GROUPS = _build_fused_pattern(BASE_FIELD_KEYS)
+# Per-field RE2 patterns, used once the fused scan has spent its match budget
+_BASE_FIELD_RE2 = {key: re2.compile("(?i)" + _to_re2(_RAW_PATTERNS[key])) for key in BASE_FIELD_KEYS}
+FUSED_SCAN_MATCH_BUDGET = 64
+
+_DATE_LIKE_RE = re.compile(r"^\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}$")
+
+# Section headers for extract_critical_sections; each section body runs to the next numbered clause
+_SECTION_HEADERS = {
+    "eligibility": r"Eligibility|Qualification|Who Can Bid",
+    "financial": r"Financial Requirements?|EMD|Tender Fee",
+    "scope_of_work": r"Scope of Work|Technical Specs?",
+    "terms_conditions": r"Terms and Conditions|Special Conditions",
+    "timeline": r"Important Dates?|Timeline|Schedule",
+}
+_SECTION_BODY = r".*?\n(.*?)(?=\n\s*\d+\.|\Z)"
+
+SECTION_PATTERNS = {
+    name: re.compile(f"(?:{header}){_SECTION_BODY}", re.IGNORECASE | re.DOTALL)
+    for name, header in _SECTION_HEADERS.items()
+}
+# All section headers in one alternation, dispatched on lastgroup
+SECTION_HEADERS_RE = re.compile(
+    "|".join(f"(?P<{name}>{header})" for name, header in _SECTION_HEADERS.items()), re.IGNORECASE
+)
+
+# Weighted portal indicators used by detect_portal
+GEM_INDICATORS = [
+    ("Government e-Marketplace", 2),
+    ("GeM Portal", 2),
+    ("gem.gov.in", 3),
+    ("GEM/202", 3),
+    ("बिडर का न्यूनतम", 2),
+    ("मूल उपकरण निर्माता", 2),
+    ("Buyer Added Terms", 2),
+    ("ePBG", 2),
+    ("Pre-Qualification Requirement", 1),
+    ("Document required from seller", 2),
+    ("Item Category", 1),
+    ("Total Quantity", 1),
+]
+
+CPPP_INDICATORS = [
+    ("Central Public Procurement Portal", 3),
+    ("CPPP", 3),
+    ("eprocure.gov.in", 3),
+    ("Envelope-1", 2),
+    ("Envelope-2", 2),
+    ("Date & time of issue", 2),
+    ("Due Date & time of Submission", 2),
+    ("Online Submission", 1),
+    ("Offline Submission", 1),
+    ("NIT No", 2),
+    ("Technical Proposal", 1),
+]
+
+def _build_indicator_automaton() -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton over the lowercased portal indicators."""
+    automaton = ahocorasick.Automaton()
+    for portal, indicators in (("GeM", GEM_INDICATORS), ("CPPP", CPPP_INDICATORS)):
+        for indicator, weight in indicators:
+            automaton.add_word(indicator.lower(), (portal, indicator, weight))
+    automaton.make_automaton()
+    return automaton
+
+_INDICATOR_AUTOMATON = _build_indicator_automaton()
+_INDICATOR_COUNT = len(GEM_INDICATORS) + len(CPPP_INDICATORS)
+_MAX_INDICATOR_LEN = max(len(i) for i, _ in GEM_INDICATORS + CPPP_INDICATORS)
+# Text is lowercased one window at a time instead of copying the whole document
+PORTAL_SCAN_WINDOW = 1 << 20
+
+# Results of the whole-document functions, keyed by a content hash of the text
+RESULT_CACHE_SIZE = 256
+_RESULT_CACHE: "OrderedDict[Tuple, Any]" = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+
+def _cached_by_text(func):
+    """
+    Memoize a function of (text, ...) in a shared LRU keyed by an xxh3 hash of the text.
+    Hashing runs at memory speed, far cheaper than the regex passes it saves on re-processing.
+    Callers receive deep copies so they may mutate results freely.
+    Callers that already hold the text's UTF-8 encoding pass it as data to skip re-encoding;
+    it is forwarded to functions that declare a data parameter.
+    """
+    forwards_data = "data" in inspect.signature(func).parameters
+
+    @wraps(func)
+    def wrapper(text: str, *args, data: Optional[bytes] = None, **kwargs):
+        if data is None:
+            data = _utf8(text)
+        digest = xxhash.xxh3_64_intdigest(data)
+        key = (func.__name__, len(text), digest, args, tuple(sorted(kwargs.items())))
+        with _RESULT_CACHE_LOCK:
+            if key in _RESULT_CACHE:
+                _RESULT_CACHE.move_to_end(key)
+                return copy.deepcopy(_RESULT_CACHE[key])
+        if forwards_data:
+            kwargs["data"] = data
+        result = func(text, *args, **kwargs)
+        with _RESULT_CACHE_LOCK:
+            _RESULT_CACHE[key] = result
+            if len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+                _RESULT_CACHE.popitem(last=False)
+        return copy.deepcopy(result)
+    return wrapper
+
 def extract_field(text: str, pattern_key: str) -> Optional[str]:
     """
     Extract a single field from text using a predefined regex pattern.
@@ -49,11 +241,50 @@ def extract_field(text: str, pattern_key: str) -> Optional[str]:
     """
     pattern = PATTERNS.get(pattern_key)
     if not pattern: return None
-    match = re.search(pattern, text, re.IGNORECASE)
+    match = pattern.search(text)
     if match:
         return match.group(1) if match.lastindex else match.group(0)
     return None
 
+def _scan_base_fields(text: Union[str, bytes]) -> Dict[str, str]:
+    """
+    Find the first match of every base field in one linear-time RE2 traversal of the text.
+    The text is scanned as UTF-8 bytes, encoded at most once per document (bytes are used as is);
+    only the matched values are decoded back to str.
+    Scanning resumes one byte after each match start (not its end) so a long match never
+    hides another field starting inside it, e.g. a GeM ID after "Ref No:". No two base
+    patterns can match at the same position, so results equal per-field searches.
+    Text dense with repeat matches is bounded by FUSED_SCAN_MATCH_BUDGET, after which the
+    remaining fields are searched individually from the current position.
+
+    Args:
+        text (Union[str, bytes]): Document text, or its UTF-8 encoding.
+
+    Returns:
+        Dict[str, str]: Mapping of pattern key to its first extracted value.
+    """
+    data = text if isinstance(text, bytes) else _utf8(text)
+    found = {}
+    search = _BASE_FIELDS_RE.search
+    pos = 0
+    for _ in range(FUSED_SCAN_MATCH_BUDGET):
+        match = search(data, pos)
+        if not match:
+            return found
+        key, value_group = _BASE_FIELD_GROUPS[match.lastindex]
+        if key not in found:
+            found[key] = match.group(value_group).decode("utf-8", "surrogatepass")
+            if len(found) == len(_BASE_FIELD_GROUPS):
+                return found
+        pos = match.start() + 1
+
+    for key, pattern in _BASE_FIELD_RE2.items():
+        if key not in found:
+            match = pattern.search(data, pos)
+            if match:
+                found[key] = match.group(1 if match.lastindex else 0).decode("utf-8", "surrogatepass")
+    return found
+
 def extract_all_dates(text: str) -> List[str]:
     """
     Extract all date-like strings from the document text.
@@ -62,13 +293,12 @@ def extract_all_dates(text: str) -> List[str]:
         text (str): Document text.
 
     Returns:
-        List[str]: List of unique date strings found.
+        List[str]: Unique date strings in order of first appearance.
     """
-    dates = []
-    for k in ["date_dd_mm_yyyy", "date_dd_mmm_yyyy"]:
-        dates.extend(re.findall(PATTERNS[k], text, re.IGNORECASE))
-    return list(set(dates))
+    # dict.fromkeys dedupes while keeping document order
+    return list(dict.fromkeys(m.group(0) for m in _DATES_RE.finditer(text)))
 
+@_cached_by_text
 def detect_portal(text: str) -> str:
     """
     Detect which government portal the tender belongs to using keyword weights.
@@ -79,47 +309,19 @@ def detect_portal(text: str) -> str:
     Returns:
         str: "GeM", "CPPP", or "Generic".
     """
-    gem_score = 0
-    cppp_score = 0
-
-    gem_indicators = [
-        ("Government e-Marketplace", 2),
-        ("GeM Portal", 2),
-        ("gem.gov.in", 3),
-        ("GEM/202", 3),
-        ("बिडर का न्यूनतम", 2),
-        ("मूल उपकरण निर्माता", 2),
-        ("Buyer Added Terms", 2),
-        ("ePBG", 2),
-        ("Pre-Qualification Requirement", 1),
-        ("Document required from seller", 2),
-        ("Item Category", 1),
-        ("Total Quantity", 1),
-    ]
-
-    cppp_indicators = [
-        ("Central Public Procurement Portal", 3),
-        ("CPPP", 3),
-        ("eprocure.gov.in", 3),
-        ("Envelope-1", 2),
-        ("Envelope-2", 2),
-        ("Date & time of issue", 2),
-        ("Due Date & time of Submission", 2),
-        ("Online Submission", 1),
-        ("Offline Submission", 1),
-        ("NIT No", 2),
-        ("Technical Proposal", 1),
-    ]
-
-    text_lower = text.lower()
-
-    for indicator, weight in gem_indicators:
-        if indicator.lower() in text_lower:
-            gem_score += weight
-
-    for indicator, weight in cppp_indicators:
-        if indicator.lower() in text_lower:
-            cppp_score += weight
+    scores = {"GeM": 0, "CPPP": 0}
+    seen = set()
+    # One pass over the text scores every indicator; each indicator counts once.
+    # Windows overlap by the longest indicator so matches across boundaries are kept.
+    for start in range(0, len(text), PORTAL_SCAN_WINDOW):
+        window = text[start:start + PORTAL_SCAN_WINDOW + _MAX_INDICATOR_LEN - 1].lower()
+        for _, (portal, indicator, weight) in _INDICATOR_AUTOMATON.iter(window):
+            if indicator not in seen:
+                seen.add(indicator)
+                scores[portal] += weight
+        if len(seen) == _INDICATOR_COUNT:
+            break
+    gem_score, cppp_score = scores["GeM"], scores["CPPP"]
 
     logger.info(f"Portal detection - GeM score: {gem_score}, CPPP score: {cppp_score}")
 
@@ -130,35 +332,68 @@ def detect_portal(text: str) -> str:
     else:
         return "Generic"
 
-def extract_structured_fields(text: str) -> Dict[str, any]:
+@_cached_by_text
+def extract_structured_fields(
+    text: str, portal: Optional[str] = None, data: Optional[bytes] = None
+) -> Dict[str, any]:
     """
     Root function to extract fields using regex before LLM processing.
     Routes to portal-specific regex rules.
 
     Args:
         text (str): Full document text.
+        portal (Optional[str]): Portal already detected for this text; detected here if omitted.
+        data (Optional[bytes]): UTF-8 encoding of text, if the caller already has it.
 
     Returns:
         Dict[str, any]: dictionary of regex-extracted fields.
     """
-    portal = detect_portal(text)
+    data = data if data is not None else _utf8(text)
+    portal = portal or detect_portal(text, data=data)
     logger.info(f"Routing extraction to {portal} extraction logic")
 
     if portal == "GeM":
         gem_extracted = extract_gem_fields(text)
-        return _extract_base_fields(text, portal, gem_extracted)
+        return _extract_base_fields(data, portal, gem_extracted)
     elif portal == "CPPP":
         cppp_extracted = extract_cppp_fields(text)
-        return _extract_base_fields(text, portal, cppp_extracted)
+        return _extract_base_fields(data, portal, cppp_extracted)
     else:
-        return _extract_base_fields(text, portal, {})
+        return _extract_base_fields(data, portal, {})
 
-def _extract_base_fields(text: str, portal: str, portal_specific: Dict[str, any]) -> Dict[str, any]:
+def extract_all(text: str, portal: Optional[str] = None) -> Tuple[Dict[str, any], Dict[str, str]]:
+    """
+    Run rule-based field extraction and critical-section extraction for one document.
+    The text is encoded to UTF-8 once and shared by both cache keys and the RE2 scan.
+
+    Args:
+        text (str): Full document text.
+        portal (Optional[str]): Portal already detected for this text; detected here if omitted.
+
+    Returns:
+        Tuple[Dict[str, any], Dict[str, str]]: Regex-extracted fields and critical sections.
+    """
+    data = _utf8(text)
+    return extract_structured_fields(text, portal, data=data), extract_critical_sections(text, data=data)
+
+# Base fields copied straight from the scan: (pattern_key, output_key, formatter)
+_FIELD_HANDLERS = [
+    ("emd_amount", "emd", "₹{}".format),
+    ("tender_fee", "tender_fee", "₹{}".format),
+    ("bid_start_date", "bid_start", str),
+    ("bid_end_date", "bid_end", str),
+    ("tech_opening", "tech_opening", str),
+    ("financial_opening", "financial_opening", str),
+    ("bid_validity_period", "bid_validity", "{} days".format),
+    ("turnover", "turnover_requirement", "₹{}".format),
+]
+
+def _extract_base_fields(data: bytes, portal: str, portal_specific: Dict[str, any]) -> Dict[str, any]:
     """
     Internal helper to extract common fields applicable across all portals.
 
     Args:
-        text (str): Document text.
+        data (bytes): UTF-8 encoded document text.
         portal (str): Detected portal name.
         portal_specific (dict): Fields already extracted by specific rules.
 
@@ -168,44 +403,36 @@ def _extract_base_fields(text: str, portal: str, portal_specific: Dict[str, any]
     extracted = {"portal": portal}
     extracted.update(portal_specific)
 
+    hits = _scan_base_fields(data)
+
     if "tender_id" not in extracted:
-        tid = extract_field(text, "tender_id_gem") or extract_field(text, "tender_id_generic")
-        if tid and not re.match(r"^\d{1,2}[-/\.]\d{1,2}[-/\.]\d{2,4}$", tid):
+        # Both ID patterns come from the one fused scan; a GeM ID wins wherever it appears
+        tid = hits.get("tender_id_gem") or hits.get("tender_id_generic")
+        if tid and not _DATE_LIKE_RE.match(tid):
             extracted["tender_id"] = tid
 
-    if "emd" not in extracted:
-        emd = extract_field(text, "emd_amount")
-        if emd: extracted["emd"] = f"₹{emd}"
-
-    if "tender_fee" not in extracted:
-        fee = extract_field(text, "tender_fee")
-        if fee: extracted["tender_fee"] = f"₹{fee}"
-
-    for f in ["bid_start", "bid_end", "tech_opening", "financial_opening"]:
-        if f not in extracted:
-            val = extract_field(text, f"{f}_date" if "bid" in f else f)
-            if val: extracted[f] = val
-
-    if "bid_validity" not in extracted:
-        bval = extract_field(text, "bid_validity_period")
-        if bval: extracted["bid_validity"] = f"{bval} days"
-
-    if "turnover_requirement" not in extracted:
-        turnover = extract_field(text, "turnover")
-        if turnover: extracted["turnover_requirement"] = f"₹{turnover}"
+    for pattern_key, output_key, formatter in _FIELD_HANDLERS:
+        if output_key not in extracted:
+            val = hits.get(pattern_key)
+            if val: extracted[output_key] = formatter(val)
 
     if "experience_required" not in extracted:
-        exp = extract_field(text, "experience_years")
-        proj = extract_field(text, "similar_projects")
-        if exp or proj:
-            extracted["experience_required"] = " / ".join(filter(None, [f"{exp} years" if exp else None, f"{proj} projects" if proj else None]))
+        exp = hits.get("experience_years")
+        proj = hits.get("similar_projects")
+        if exp and proj:
+            extracted["experience_required"] = f"{exp} years / {proj} projects"
+        elif exp:
+            extracted["experience_required"] = f"{exp} years"
+        elif proj:
+            extracted["experience_required"] = f"{proj} projects"
 
     for k, v in [("msme_exemption", "msme_exemption"), ("startup_exemption", "startup_exemption")]:
-        if v not in extracted and re.search(PATTERNS[k], text, re.IGNORECASE):
+        if v not in extracted and k in hits:
             extracted[v] = "Yes"
 
     return extracted
 
+@_cached_by_text
 def extract_critical_sections(text: str) -> Dict[str, str]:
     """
     Extract relevant sections of the document to reduce LLM context size.
@@ -217,14 +444,18 @@ def extract_critical_sections(text: str) -> Dict[str, str]:
         Dict[str, str]: Mapping of section name to extracted text snippet.
     """
     sections = {}
-    pats = {
-        "eligibility": r"(?:Eligibility|Qualification|Who Can Bid).*?\n(.*?)(?=\n\s*\d+\.|\Z)",
-        "financial": r"(?:Financial Requirements?|EMD|Tender Fee).*?\n(.*?)(?=\n\s*\d+\.|\Z)",
-        "scope_of_work": r"(?:Scope of Work|Technical Specs?).*?\n(.*?)(?=\n\s*\d+\.|\Z)",
-        "terms_conditions": r"(?:Terms and Conditions|Special Conditions).*?\n(.*?)(?=\n\s*\d+\.|\Z)",
-        "timeline": r"(?:Important Dates?|Timeline|Schedule).*?\n(.*?)(?=\n\s*\d+\.|\Z)",
-    }
-    for name, pat in pats.items():
-        match = re.search(pat, text, re.IGNORECASE | re.DOTALL)
-        if match: sections[name] = match.group(1).strip()[:5000]
-    return sections
+    pos = 0
+    # One pass over the headers; a section body is only matched at its own header positions
+    while len(sections) < len(SECTION_PATTERNS):
+        header = SECTION_HEADERS_RE.search(text, pos)
+        if not header:
+            break
+        name = header.lastgroup
+        if name not in sections:
+            match = SECTION_PATTERNS[name].match(text, header.start())
+            if not match:
+                # A body only fails to match when no newline follows, so no later header can match
+                break
+            sections[name] = match.group(1).strip()[:5000]
+        pos = header.start() + 1
+    return {name: sections[name] for name in SECTION_PATTERNS if name in sections}
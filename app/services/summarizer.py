@@ -4,15 +4,25 @@ Manages the end-to-end pipeline: PDF extraction, portal detection, rule-based pa
 LLM analysis (single-pass or batch), gap filling, and validation.
 """
 
-import json
+import asyncio
+import copy
+import hashlib
 import logging
 import os
-from typing import List, Dict, Any
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from fastapi import UploadFile
 
-from app.services.pdf_extractor import extract_text_and_links, fetch_external_pdfs
-from app.services.rule_parser import extract_structured_fields, extract_critical_sections, detect_portal
-from app.services.groq_client import call_groq_with_retry, validate_json_response, estimate_tokens
+from app.services.pdf_extractor import extract_text_and_links, fetch_external_pdfs, read_upload
+from app.services.cpu_pool import run_cpu_bound
+from app.services.rule_parser import extract_all, extract_structured_fields, extract_critical_sections
+from app.services.groq_client import (
+    call_groq_with_retry, validate_json_response, estimate_tokens, to_prompt_json,
+    MAX_OUTPUT_TOKENS, MAX_COMPLETION_TOKENS
+)
 from app.services.batch_processor import process_large_document
 from app.services.gap_filler import get_missing_field_summary, fill_missing_fields
 from app.services.portal_validator import validate_extraction_completeness
@@ -23,6 +33,49 @@ logger = logging.getLogger(__name__)
 SINGLE_PASS_TOKEN_LIMIT = 40000
 DEFAULT_CONTEXT_BUDGET = 15000
 
+# Final summaries of recently processed uploads, keyed by a digest of their combined text
+SUMMARY_CACHE_SIZE = 256
+SUMMARY_CACHE_TTL = 3600
+_SUMMARY_CACHE: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+# The schema never changes at runtime, so it is serialized once at import
+_SCHEMA_JSON = to_prompt_json(TENDER_SCHEMA)
+
+# Summary values treated as absent by clean_empty_fields (compared stripped and lowercased).
+# strip() returns the same object when there is no padding and the length guard skips lower()
+# for real values, which measures faster than a compiled fullmatch regex over every leaf.
+_STOP_WORDS = frozenset({"not found", "not mentioned", "not specified", "n/a", "", "null", "none"})
+_STOP_WORD_MAX_LEN = max(len(w) for w in _STOP_WORDS)
+
+# Several small tenders of one portal extracted in one call. The portal template's instructions
+# and schema form the static prefix; this batch section and the tenders are appended after it.
+BATCH_TENDER_PROMPT = """====================
+BATCH OF {count} TENDERS
+====================
+
+Apply the instructions above to EACH of the {count} SEPARATE tenders below, analyzing each independently and never mixing information between tenders.
+Return ONLY a JSON object of the form {{"tenders": [<tender 1>, <tender 2>, ...]}} holding exactly {count} items, in the same order as the tenders below.
+Each item MUST match the output schema above. If information is missing for a tender, use "Not Found" for strings and empty lists for arrays.
+
+{tenders}"""
+# Tenders per batched call, bounded so every tender keeps a full single-pass output budget
+BATCH_MAX_TENDERS = MAX_COMPLETION_TOKENS // MAX_OUTPUT_TOKENS
+# Where the per-tender sections of a portal template begin
+_PRE_EXTRACTED_BANNER = "====================\nPRE-EXTRACTED DATA\n"
+# Where the closing instructions after a portal template's tender text begin
+_SECTION_RULE = "===================="
+
+# Per-request prompt placeholders, substituted in a single pass over the template
+_PLACEHOLDER_RE = re.compile(r"\{\{(RULE_EXTRACTED_DATA|TENDER_TEXT)\}\}")
+
+# Prompt template file for each portal type
+PROMPT_FILES = {
+    "GeM": "gem_prompt.txt",
+    "CPPP": "cppp_prompt.txt",
+    "Generic": "generic_prompt.txt"
+}
+
+@lru_cache(maxsize=8)
 def load_prompt_template(portal_type: str = "Generic") -> str:
     """
     Load the portal-specific prompt template from the prompts directory.
@@ -33,12 +86,7 @@ def load_prompt_template(portal_type: str = "Generic") -> str:
     Returns:
         str: Prompt template content.
     """
-    prompt_map = {
-        "GeM": "gem_prompt.txt",
-        "CPPP": "cppp_prompt.txt",
-        "Generic": "generic_prompt.txt"
-    }
-    filename = prompt_map.get(portal_type, "generic_prompt.txt")
+    filename = PROMPT_FILES.get(portal_type, "generic_prompt.txt")
     prompt_path = os.path.join(os.path.dirname(__file__), "../prompts", filename)
 
     try:
@@ -50,7 +98,31 @@ def load_prompt_template(portal_type: str = "Generic") -> str:
         with open(fallback, "r", encoding="utf-8") as f:
             return f.read()
 
-def prepare_smart_context(full_text: str, rule_data: Dict, sections: Dict, budget: int = DEFAULT_CONTEXT_BUDGET) -> str:
+@lru_cache(maxsize=8)
+def _prompt_header_template(portal_type: str) -> str:
+    """Return the portal's prompt template with the static schema JSON already substituted."""
+    return load_prompt_template(portal_type).replace("{{SCHEMA_JSON}}", _SCHEMA_JSON)
+
+@lru_cache(maxsize=8)
+def _batch_prompt_prefix(portal_type: str) -> str:
+    """Return the static part of the portal's prompt (instructions and schema) shared by batched calls."""
+    header = _prompt_header_template(portal_type)
+    end = header.find(_PRE_EXTRACTED_BANNER)
+    return header[:end] if end >= 0 else header[:header.find("{{RULE_EXTRACTED_DATA}}")]
+
+@lru_cache(maxsize=8)
+def _batch_prompt_suffix(portal_type: str) -> str:
+    """Return the closing instructions that follow the tender text in the portal's prompt."""
+    header = _prompt_header_template(portal_type)
+    end = header.find(_SECTION_RULE, header.find("{{TENDER_TEXT}}"))
+    return "\n\n" + header[end:] if end >= 0 else ""
+
+async def warm_prompt_templates() -> None:
+    """Read every prompt template into the cache off the event loop, so no request pays the disk read."""
+    await asyncio.gather(*(asyncio.to_thread(_batch_prompt_suffix, portal) for portal in PROMPT_FILES))
+
+def prepare_smart_context(full_text: str, rule_data: Dict, sections: Dict, budget: int = DEFAULT_CONTEXT_BUDGET,
+                          tokens: Optional[int] = None, rule_json: Optional[str] = None) -> str:
     """
     Build optimized context for single-pass LLM calls by prioritizing critical sections.
 
@@ -59,16 +131,23 @@ def prepare_smart_context(full_text: str, rule_data: Dict, sections: Dict, budge
         rule_data (Dict): Pre-extracted regex fields.
         sections (Dict): Text chunks organized by section headers.
         budget (int): Target token budget for the context.
+        tokens (Optional[int]): Token estimate of full_text if the caller already has it.
+        rule_json (Optional[str]): rule_data already serialized by the caller.
 
     Returns:
         str: Formatted context string.
     """
-    context = [f"=== PRE-EXTRACTED DATA ===\n{json.dumps(rule_data, indent=2)}\n\n"]
-    if estimate_tokens(full_text) < (budget * 0.9):
-        context.append(f"=== COMPLETE TENDER DOCUMENT ===\n{full_text}\n")
+    if rule_json is None:
+        rule_json = to_prompt_json(rule_data)
+    header = f"=== PRE-EXTRACTED DATA ===\n{rule_json}\n\n"
+    context = [header]
+    if tokens is None:
+        tokens = estimate_tokens(full_text)
+    if tokens < (budget * 0.9):
+        context.extend(("=== COMPLETE TENDER DOCUMENT ===\n", full_text, "\n"))
         return "".join(context)
 
-    avail = budget - estimate_tokens("".join(context)) - 500
+    avail = budget - estimate_tokens(header) - 500
     section_map = [
         ("eligibility", "ELIGIBILITY CRITERIA", 0.30),
         ("financial", "FINANCIAL REQUIREMENTS", 0.25),
@@ -81,24 +160,169 @@ def prepare_smart_context(full_text: str, rule_data: Dict, sections: Dict, budge
         if key in sections:
             limit = int(avail * ratio * 5)
             content = sections[key]
+            # Pieces go straight into the part list so the final join is the only full copy
+            context.extend(("\n=== ", title, " ===\n"))
             if len(content) > limit:
                 half = limit // 2
-                content = content[:half] + "\n... [truncated] ...\n" + content[-half:]
-            context.append(f"\n=== {title} ===\n{content}\n")
+                context.extend((content[:half], "\n... [truncated] ...\n", content[-half:]))
+            else:
+                context.append(content)
+            context.append("\n")
     return "".join(context)
 
-async def _run_single_pass(full_text: str, rule_data: Dict, portal_type: str = "Generic") -> Dict[str, Any]:
+def _build_single_pass_prompt(full_text: str, rule_data: Dict, portal_type: str, tokens: Optional[int],
+                              sections: Optional[Dict[str, str]] = None) -> str:
+    """Assemble the single-pass prompt: section extraction, JSON encoding and template filling."""
+    if sections is None:
+        sections = extract_critical_sections(full_text)
+    rule_json = to_prompt_json(rule_data)
+    optimized = prepare_smart_context(full_text, rule_data, sections, tokens=tokens, rule_json=rule_json)
+    values = {
+        "RULE_EXTRACTED_DATA": rule_json,
+        "TENDER_TEXT": optimized,
+    }
+    return _PLACEHOLDER_RE.sub(lambda m: values[m.group(1)], _prompt_header_template(portal_type))
+
+def _validate_summary(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce raw extraction output to the canonical TenderSummary shape."""
+    return TenderSummary(**data).model_dump()
+
+def _parse_summary(res: str) -> Dict[str, Any]:
+    """Parse an LLM response and validate it against TenderSummary."""
+    return _validate_summary(validate_json_response(res))
+
+async def _run_single_pass(full_text: str, rule_data: Dict, portal_type: str = "Generic",
+                           tokens: Optional[int] = None, sections: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """Execute a single-pass extraction using the full or smart context."""
-    optimized = prepare_smart_context(full_text, rule_data, extract_critical_sections(full_text))
-    prompt = load_prompt_template(portal_type).replace(
-        "{{SCHEMA_JSON}}", json.dumps(TENDER_SCHEMA, indent=2)
-    ).replace(
-        "{{RULE_EXTRACTED_DATA}}", json.dumps(rule_data, indent=2)
-    ).replace(
-        "{{TENDER_TEXT}}", optimized
-    )
+    # CPU-bound prompt assembly and parsing run in worker threads to keep the event loop free
+    prompt = await asyncio.to_thread(_build_single_pass_prompt, full_text, rule_data, portal_type, tokens, sections)
     res = await call_groq_with_retry(prompt)
-    return TenderSummary(**validate_json_response(res)).model_dump()
+    return await asyncio.to_thread(_parse_summary, res)
+
+async def _extract_file_text(upload: UploadFile, primary: bool) -> str:
+    """Extract one uploaded file's text; only the primary document's external PDF links are followed."""
+    pdf_bytes = await read_upload(upload)
+    text, links = await extract_text_and_links(pdf_bytes, collect_links=primary)
+    # Release the PDF before any external downloads start
+    del pdf_bytes
+    if primary and links:
+        ext_texts = await fetch_external_pdfs(links)
+        text += "\n\n" + "\n\n".join(ext_texts)
+    return text
+
+async def _read_tender_files(pdf_files: List[UploadFile]) -> Tuple[List[Dict[str, str]], str]:
+    """
+    Read and extract the text of one tender's files.
+
+    Args:
+        pdf_files (List[UploadFile]): Uploaded files; the first is the primary document.
+
+    Returns:
+        Tuple[List[Dict[str, str]], str]: Per-file documents and their combined text.
+    """
+    # Read and extract all files concurrently; the primary's link fetch overlaps the rest.
+    # Each file's bytes live only until its own text is extracted.
+    texts = await asyncio.gather(*(
+        _extract_file_text(f, primary=(idx == 0)) for idx, f in enumerate(pdf_files)
+    ))
+    all_docs, parts = [], []
+    for f, text in zip(pdf_files, texts):
+        all_docs.append({"filename": f.filename, "content": text})
+        parts.extend((f"\n\n=== {f.filename} ===\n", text))
+    return all_docs, "".join(parts)
+
+def _revalidate_changed(summary: Dict[str, Any], updated: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Schema-validate only the top-level sections of updated that differ from an already validated summary.
+
+    Args:
+        summary (Dict[str, Any]): Output of TenderSummary.model_dump().
+        updated (Dict[str, Any]): summary with some sections replaced, e.g. by gap filling.
+
+    Returns:
+        Dict[str, Any]: Same result as TenderSummary(**updated).model_dump().
+    """
+    changed = {k: v for k, v in updated.items() if k in TenderSummary.model_fields and summary.get(k) != v}
+    if not changed:
+        return summary
+    validated = TenderSummary.model_validate(changed).model_dump(include=set(changed))
+    return {**summary, **validated}
+
+async def _finalize_summary(summary: Dict[str, Any], all_docs: List[Dict[str, str]],
+                            portal_type: str, tokens: int) -> Dict[str, Any]:
+    """Fill critical gaps, validate, attach metadata and strip empty fields from a schema-valid summary."""
+    # Recursive Gap Filling
+    missing = get_missing_field_summary(summary)
+    fields_filled_count = 0
+    if missing['critical_missing'] > 0:
+        logger.info(f"Filling {missing['critical_missing']} gaps for {portal_type}")
+        filled_res = await fill_missing_fields(summary, all_docs)
+        if filled_res != summary:
+            # Ensure gap-filled result also adheres to schema
+            summary = await asyncio.to_thread(_revalidate_changed, summary, filled_res)
+            new_missing = get_missing_field_summary(summary)
+            fields_filled_count = missing['critical_missing'] - new_missing['critical_missing']
+
+    # Validation
+    validation = validate_extraction_completeness(summary, portal_type)
+
+    summary["_metadata"] = {
+        "portal_type": portal_type,
+        "files_processed": [d["filename"] for d in all_docs],
+        "total_tokens": tokens,
+        "fields_filled": fields_filled_count,
+        "validation": validation
+    }
+    return await asyncio.to_thread(clean_empty_fields, summary)
+
+def _run_rules(text: str) -> Tuple[str, Dict[str, Any]]:
+    """Detect the portal and run rule-based extraction for one tender's text."""
+    rule_data = extract_structured_fields(text)
+    return rule_data["portal"], rule_data
+
+def _run_rules_with_sections(text: str) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    """Like _run_rules, also extracting the critical sections used by the single-pass context."""
+    rule_data, sections = extract_all(text)
+    return rule_data["portal"], rule_data, sections
+
+async def _summarize_tender(all_docs: List[Dict[str, str]], combined_text: str) -> Dict[str, Any]:
+    """Run detection, rule parsing, LLM extraction and finalization for one tender's text."""
+    tokens = estimate_tokens(combined_text)
+
+    # Strategy selection
+    if tokens <= SINGLE_PASS_TOKEN_LIMIT:
+        portal_type, rule_data, sections = await run_cpu_bound(_run_rules_with_sections, combined_text)
+        summary = await _run_single_pass(combined_text, rule_data, portal_type, tokens, sections)
+    else:
+        portal_type, rule_data = await run_cpu_bound(_run_rules, combined_text)
+        logger.info(f"Using batch processing for large document ({tokens} tokens)")
+        res_data = await process_large_document(combined_text, rule_data, TENDER_SCHEMA)
+        summary = await asyncio.to_thread(_validate_summary, res_data)
+
+    return await _finalize_summary(summary, all_docs, portal_type, tokens)
+
+def _summary_digest(combined_text: str) -> str:
+    """Return the summary cache key of a tender's combined text; file names are part of the text."""
+    return hashlib.blake2b(combined_text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+def _get_cached_summary(digest: str) -> Optional[Dict[str, Any]]:
+    """Return a copy of a cached summary that has not expired, or None."""
+    entry = _SUMMARY_CACHE.get(digest)
+    if entry is None:
+        return None
+    stored_at, summary = entry
+    if time.monotonic() - stored_at > SUMMARY_CACHE_TTL:
+        _SUMMARY_CACHE.pop(digest, None)
+        return None
+    _SUMMARY_CACHE.move_to_end(digest)
+    return copy.deepcopy(summary)
+
+def _store_cached_summary(digest: str, summary: Dict[str, Any]) -> None:
+    """Cache a copy of a final summary, evicting the least recently used entry when full."""
+    _SUMMARY_CACHE[digest] = (time.monotonic(), copy.deepcopy(summary))
+    _SUMMARY_CACHE.move_to_end(digest)
+    if len(_SUMMARY_CACHE) > SUMMARY_CACHE_SIZE:
+        _SUMMARY_CACHE.popitem(last=False)
 
 async def process_tender_multi_file(pdf_files: List[UploadFile]) -> Dict[str, Any]:
     """
@@ -106,72 +330,179 @@ async def process_tender_multi_file(pdf_files: List[UploadFile]) -> Dict[str, An
     Coordinates extraction, detection, processing, gap-filling, and validation.
     """
     try:
-        all_docs, combined_text = [], ""
-        for idx, f in enumerate(pdf_files):
-            text, links = await extract_text_and_links(await f.read())
-            if idx == 0 and links: # Only follow links from primary document
-                ext_texts = await fetch_external_pdfs(links)
-                text += "\n\n" + "\n\n".join(ext_texts)
-            all_docs.append({"filename": f.filename, "content": text})
-            combined_text += f"\n\n=== {f.filename} ===\n{text}"
-
-        portal_type = detect_portal(combined_text)
-        rule_data = extract_structured_fields(combined_text)
-        tokens = estimate_tokens(combined_text)
-
-        # Strategy selection
-        if tokens <= SINGLE_PASS_TOKEN_LIMIT:
-            summary = await _run_single_pass(combined_text, rule_data, portal_type)
+        all_docs, combined_text = await _read_tender_files(pdf_files)
+        # Re-submitted uploads skip every rule and LLM step
+        digest = _summary_digest(combined_text)
+        cached = _get_cached_summary(digest)
+        if cached is not None:
+            logger.info(f"Returning cached summary for {digest}")
+            return cached
+        summary = await _summarize_tender(all_docs, combined_text)
+        _store_cached_summary(digest, summary)
+        return summary
+    except Exception as e:
+        logger.error(f"Summarization pipeline failed: {str(e)}")
+        raise
+
+def _build_batched_prompt(texts: List[str], rule_data: List[Dict], sections: List[Dict[str, str]],
+                          tokens: List[int], portal_type: str) -> str:
+    """Assemble a batched prompt: the portal's instructions, each tender's smart context, then its closing section."""
+    blocks = []
+    for i, (text, data, secs, tok) in enumerate(zip(texts, rule_data, sections, tokens), 1):
+        context = prepare_smart_context(text, data, secs, tokens=tok, rule_json=to_prompt_json(data))
+        blocks.extend((f"=== TENDER {i} ===\n", context, "\n"))
+    return "".join((
+        _batch_prompt_prefix(portal_type),
+        BATCH_TENDER_PROMPT.format(count=len(texts), tenders="".join(blocks)),
+        _batch_prompt_suffix(portal_type),
+    ))
+
+async def _run_batched_pass(texts: List[str], rule_data: List[Dict], sections: List[Dict[str, str]],
+                            tokens: List[int], portal_type: str) -> List[Dict[str, Any]]:
+    """
+    Extract several small tenders of one portal with a single LLM call sharing the portal's prompt prefix.
+
+    Args:
+        texts (List[str]): Combined text of each tender.
+        rule_data (List[Dict]): Pre-extracted regex fields of each tender.
+        sections (List[Dict[str, str]]): Critical sections of each tender.
+        tokens (List[int]): Token estimate of each tender's text.
+        portal_type (str): Portal shared by all the tenders.
+
+    Returns:
+        List[Dict[str, Any]]: Schema-validated summary of each tender, in input order.
+
+    Raises:
+        ValueError: If the response does not hold exactly one valid summary per tender.
+    """
+    prompt = await asyncio.to_thread(_build_batched_prompt, texts, rule_data, sections, tokens, portal_type)
+    res = await call_groq_with_retry(prompt, max_tokens=MAX_OUTPUT_TOKENS * len(texts))
+    return await asyncio.to_thread(_parse_batched_summaries, res, len(texts))
+
+def _parse_batched_summaries(res: str, count: int) -> List[Dict[str, Any]]:
+    """Split a batched response into validated summaries, raising ValueError unless there are exactly count."""
+    parsed = validate_json_response(res)
+    items = parsed.get("tenders") if isinstance(parsed, dict) else None
+    if not isinstance(items, list) or len(items) != count:
+        raise ValueError(f"Expected {count} tender summaries in batched response")
+    return [_validate_summary(item) for item in items]
+
+def _plan_batches(portals: List[str], tokens: List[int]) -> List[List[int]]:
+    """
+    Group tender indices into batched calls: one portal per group, at most BATCH_MAX_TENDERS
+    tenders and SINGLE_PASS_TOKEN_LIMIT input tokens. Tenders too large for a single pass stay alone.
+
+    Args:
+        portals (List[str]): Detected portal of each tender.
+        tokens (List[int]): Token estimate of each tender's text.
+
+    Returns:
+        List[List[int]]: Index groups, each processed with one call (or individually when alone).
+    """
+    groups, by_portal = [], {}
+    for idx, (portal, tok) in enumerate(zip(portals, tokens)):
+        if tok > SINGLE_PASS_TOKEN_LIMIT:
+            groups.append([idx])
+            continue
+        # First fit among this portal's groups
+        for group in by_portal.setdefault(portal, []):
+            if len(group) < BATCH_MAX_TENDERS and sum(tokens[i] for i in group) + tok <= SINGLE_PASS_TOKEN_LIMIT:
+                group.append(idx)
+                break
         else:
-            logger.info(f"Using batch processing for large document ({tokens} tokens)")
-            res_data = await process_large_document(combined_text, rule_data, TENDER_SCHEMA)
-            summary = TenderSummary(**res_data).model_dump()
-
-        # Recursive Gap Filling
-        missing = get_missing_field_summary(summary)
-        fields_filled_count = 0
-        if missing['critical_missing'] > 0:
-            logger.info(f"Filling {missing['critical_missing']} gaps for {portal_type}")
-            filled_res = await fill_missing_fields(summary, all_docs)
-            # Ensure gap-filled result also adheres to schema
-            summary = TenderSummary(**filled_res).model_dump()
-            new_missing = get_missing_field_summary(summary)
-            fields_filled_count = missing['critical_missing'] - new_missing['critical_missing']
+            group = [idx]
+            by_portal[portal].append(group)
+            groups.append(group)
+    return groups
 
-        # Validation
-        validation = validate_extraction_completeness(summary, portal_type)
-
-        summary["_metadata"] = {
-            "portal_type": portal_type,
-            "files_processed": [d["filename"] for d in all_docs],
-            "total_tokens": tokens,
-            "fields_filled": fields_filled_count,
-            "validation": validation
-        }
-        return clean_empty_fields(summary)
+async def process_tenders_batched(tenders: List[List[UploadFile]]) -> List[Dict[str, Any]]:
+    """
+    Summarize several independent tenders, sharing one LLM call per group of small same-portal tenders.
+    Tenders already in the summary cache are returned from it. A group falls back to per-tender
+    processing when its batched call fails for any reason.
+
+    Args:
+        tenders (List[List[UploadFile]]): Uploaded files of each tender.
+
+    Returns:
+        List[Dict[str, Any]]: Summary of each tender, in input order.
+    """
+    try:
+        read = await asyncio.gather(*(_read_tender_files(files) for files in tenders))
+        digests = [_summary_digest(text) for _, text in read]
+        results: List[Optional[Dict[str, Any]]] = [_get_cached_summary(d) for d in digests]
+        pending = [i for i, cached in enumerate(results) if cached is None]
+        if len(pending) < len(read):
+            logger.info(f"Returning {len(read) - len(pending)} cached summaries")
+
+        tokens = {i: estimate_tokens(read[i][1]) for i in pending}
+        rules = dict(zip(pending, await asyncio.gather(*(
+            run_cpu_bound(_run_rules_with_sections, read[i][1]) for i in pending
+        ))))
+
+        async def run_group(group: List[int]) -> List[Dict[str, Any]]:
+            if len(group) == 1:
+                return [await _summarize_tender(*read[group[0]])]
+            portal_type = rules[group[0]][0]
+            try:
+                summaries = await _run_batched_pass(
+                    [read[i][1] for i in group], [rules[i][1] for i in group],
+                    [rules[i][2] for i in group], [tokens[i] for i in group], portal_type,
+                )
+            except Exception as e:
+                logger.warning(f"Batched extraction failed, processing {len(group)} tenders individually: {str(e)}")
+                return list(await asyncio.gather(*(_summarize_tender(*read[i]) for i in group)))
+            logger.info(f"Extracted {len(group)} {portal_type} tenders in one batched call")
+            return list(await asyncio.gather(*(
+                _finalize_summary(summary, read[i][0], portal_type, tokens[i]) for summary, i in zip(summaries, group)
+            )))
+
+        planned = _plan_batches([rules[i][0] for i in pending], [tokens[i] for i in pending])
+        groups = [[pending[j] for j in group] for group in planned]
+        for group, summaries in zip(groups, await asyncio.gather(*(run_group(g) for g in groups))):
+            for i, summary in zip(group, summaries):
+                _store_cached_summary(digests[i], summary)
+                results[i] = summary
+        return results
     except Exception as e:
-        logger.error(f"Summarization pipeline failed: {str(e)}")
+        logger.error(f"Batched summarization pipeline failed: {str(e)}")
         raise
 
 def clean_empty_fields(data: Any) -> Any:
     """
-    Recursively remove fields containing 'not mentioned' or empty indicators to clean up the final JSON.
-    """
-    stop_words = {"not found", "not mentioned", "not specified", "n/a", "", "null", "none"}
-
-    if isinstance(data, dict):
-        cleaned = {}
-        for k, v in data.items():
-            if k == "_metadata":
-                cleaned[k] = v
-                continue
-            child = clean_empty_fields(v)
-            if isinstance(child, str) and child.lower().strip() in stop_words:
-                continue
-            if child is not None and not (isinstance(child, (list, dict)) and len(child) == 0):
-                cleaned[k] = child
-        return cleaned
-    elif isinstance(data, list):
-        items = [clean_empty_fields(i) for i in data]
-        return [i for i in items if i not in (None, "", [], {})]
-    return data
+    Remove fields containing 'not mentioned' or empty indicators to clean up the final JSON.
+    Walks the tree with an explicit stack, then rebuilds containers children-first.
+    """
+    if not isinstance(data, (dict, list)):
+        return data
+
+    # Pre-order walk: every container is listed after its parent; _metadata is kept verbatim
+    order, stack = [], [data]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        if isinstance(node, dict):
+            stack.extend(v for k, v in node.items() if k != "_metadata" and isinstance(v, (dict, list)))
+        else:
+            stack.extend(v for v in node if isinstance(v, (dict, list)))
+
+    cleaned = {}
+    for node in reversed(order):
+        if isinstance(node, dict):
+            out = {}
+            for k, v in node.items():
+                if k == "_metadata":
+                    out[k] = v
+                    continue
+                child = cleaned[id(v)] if isinstance(v, (dict, list)) else v
+                if isinstance(child, str):
+                    stripped = child.strip()
+                    if len(stripped) <= _STOP_WORD_MAX_LEN and stripped.lower() in _STOP_WORDS:
+                        continue
+                if child is not None and not (isinstance(child, (list, dict)) and len(child) == 0):
+                    out[k] = child
+        else:
+            items = [cleaned[id(i)] if isinstance(i, (dict, list)) else i for i in node]
+            out = [i for i in items if i not in (None, "", [], {})]
+        cleaned[id(node)] = out
+    return cleaned[id(data)]
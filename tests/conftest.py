@@ -0,0 +1,4 @@
+import os
+
+# groq_client builds its AsyncGroq client at import time
+os.environ.setdefault("GROQ_API_KEY", "test")
@@ -0,0 +1,38 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services import batch_processor, groq_client
+
+
+def test_summarize_chunks_returns_summaries_in_chunk_order(monkeypatch):
+    async def live(prompt, *args, **kwargs):
+        return json.dumps({"chunk": prompt.rsplit("CHUNK:\n", 1)[1].strip()})
+
+    async def no_wait(tokens):
+        return None
+
+    monkeypatch.setattr(batch_processor, "call_groq_with_retry", live)
+    monkeypatch.setattr(batch_processor.rate_limiter, "wait_for_capacity", no_wait)
+    assert asyncio.run(batch_processor.summarize_chunks(["x", "y"])) == ["{'chunk': 'x'}", "{'chunk': 'y'}"]
+
+
+def test_validate_json_response_keeps_wide_integers_exact():
+    parsed = groq_client.validate_json_response('{"tender_id": 123456789012345678901234}')
+    assert parsed["tender_id"] == 123456789012345678901234
+
+
+def test_validate_json_response_accepts_nan_in_multiline_json():
+    parsed = groq_client.validate_json_response('```json\n{\n  "a": NaN,\n  "b": Infinity\n}\n```')
+    assert parsed["a"] != parsed["a"]
+    assert parsed["b"] == float("inf")
+
+
+def test_validate_json_response_repairs_literal_newlines_in_strings():
+    assert groq_client.validate_json_response('{"a": "line 1\nline 2"}') == {"a": "line 1\nline 2"}
+
+
+def test_validate_json_response_rejects_invalid_json():
+    with pytest.raises(ValueError):
+        groq_client.validate_json_response("not json")
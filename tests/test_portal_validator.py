@@ -0,0 +1,24 @@
+import pytest
+
+from app.services.portal_validator import is_field_empty
+
+
+class Label(str):
+    pass
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, True),
+    ("", True),
+    ("  Not Found ", True),
+    ("N/A", True),
+    (Label("not mentioned"), True),
+    (Label("GEM/2024/B/1"), False),
+    ("₹50,000", False),
+    ([], True),
+    ({}, True),
+    (["x"], False),
+    (0, False),
+])
+def test_is_field_empty(value, expected):
+    assert is_field_empty(value) is expected
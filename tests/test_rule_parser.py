@@ -0,0 +1,36 @@
+import pytest
+
+from app.services import rule_parser
+from app.services.rule_parser import BASE_FIELD_KEYS, PATTERNS, _scan_base_fields
+
+
+def _python_search(text, key):
+    match = PATTERNS[key].search(text)
+    if not match:
+        return None
+    return match.group(1) if match.lastindex else match.group(0)
+
+
+@pytest.mark.parametrize("text", [
+    "EXPERİENCE of 4 years",
+    "Experıence of 4 years",
+    "Tender No: Aİ/1234",
+    "NİT No: ıı/99-1",
+    "Solıcıtatıon No: XYZ-9999",
+    "MSMEs are exempted",
+    "EMD exemptİon for MSMEs",
+    "Annual Turnover of Rs. 50 Lakhs, mınımum 3 sımılar works",
+])
+def test_fused_scan_matches_python_re_on_dotted_and_dotless_i(text):
+    hits = _scan_base_fields(text)
+    for key in BASE_FIELD_KEYS:
+        assert hits.get(key) == _python_search(text, key), key
+
+
+@pytest.mark.parametrize("text, key, expected", [
+    ("EXPERİENCE of 4 years", "experience_years", "4"),
+    ("Mınımum 2 sımılar works", "similar_projects", "2"),
+    ("Bid Valıdıty: 90", "bid_validity_period", "90"),
+])
+def test_extract_field_matches_case_insensitively(text, key, expected):
+    assert rule_parser.extract_field(text, key) == expected
@@ -0,0 +1,120 @@
+import asyncio
+import io
+import json
+
+import fitz
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.services import summarizer
+from app.services.groq_client import MAX_OUTPUT_TOKENS
+
+
+def _upload(name, text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    return UploadFile(io.BytesIO(data), filename=name, size=len(data))
+
+
+@pytest.fixture(autouse=True)
+def empty_summary_cache():
+    summarizer._SUMMARY_CACHE.clear()
+    yield
+    summarizer._SUMMARY_CACHE.clear()
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Record LLM calls; each returns the next queued response or raises it."""
+    calls, responses = [], []
+
+    async def fake_call(prompt, model=None, retries=5, max_tokens=MAX_OUTPUT_TOKENS):
+        calls.append({"prompt": prompt, "max_tokens": max_tokens})
+        res = responses.pop(0)
+        if isinstance(res, Exception):
+            raise res
+        return res
+
+    async def no_fill(summary, docs):
+        return summary
+
+    monkeypatch.setattr(summarizer, "call_groq_with_retry", fake_call)
+    monkeypatch.setattr(summarizer, "fill_missing_fields", no_fill)
+    return calls, responses
+
+
+def _summary(tender_id):
+    return {"tender_meta": {"tender_id": tender_id}}
+
+
+def test_plan_batches_groups_by_portal_and_limits():
+    limit = summarizer.SINGLE_PASS_TOKEN_LIMIT
+    portals = ["GeM", "CPPP", "GeM", "GeM", "Generic"]
+    tokens = [100, 100, limit - 50, 100, limit + 1]
+    assert summarizer._plan_batches(portals, tokens) == [[0, 3], [1], [2], [4]]
+
+    many = summarizer.BATCH_MAX_TENDERS + 1
+    assert summarizer._plan_batches(["GeM"] * many, [10] * many) == [list(range(many - 1)), [many - 1]]
+
+
+def test_batched_call_uses_portal_prefix_and_scales_output_budget(llm):
+    calls, responses = llm
+    responses.append(json.dumps({"tenders": [_summary("T-1"), _summary("T-2")]}))
+    files = [[_upload("a.pdf", "Tender No: AA/1111")], [_upload("b.pdf", "Tender No: BB/2222")]]
+
+    results = asyncio.run(summarizer.process_tenders_batched(files))
+
+    assert [r["tender_meta"]["tender_id"] for r in results] == ["T-1", "T-2"]
+    assert len(calls) == 1
+    assert calls[0]["max_tokens"] == 2 * MAX_OUTPUT_TOKENS
+    prompt = calls[0]["prompt"]
+    assert prompt.startswith(summarizer._batch_prompt_prefix("Generic"))
+    assert prompt.index("OUTPUT") < prompt.index("=== TENDER 1 ===")
+    assert prompt.index("=== PRE-EXTRACTED DATA ===") < prompt.index("=== COMPLETE TENDER DOCUMENT ===")
+    assert prompt.endswith(summarizer._batch_prompt_suffix("Generic"))
+    assert "BEGIN EXTRACTION" in summarizer._batch_prompt_suffix("Generic")
+
+
+def test_batched_tenders_share_the_summary_cache(llm):
+    calls, responses = llm
+    responses.append(json.dumps(_summary("T-1")))
+    first = asyncio.run(summarizer.process_tender_multi_file([_upload("a.pdf", "Tender No: AA/1111")]))
+    responses.append(json.dumps(_summary("T-2")))
+
+    def files():
+        return [[_upload("a.pdf", "Tender No: AA/1111")], [_upload("b.pdf", "Tender No: BB/2222")]]
+
+    results = asyncio.run(summarizer.process_tenders_batched(files()))
+
+    assert results[0] == first
+    assert results[1]["tender_meta"]["tender_id"] == "T-2"
+    assert len(calls) == 2
+
+    again = asyncio.run(summarizer.process_tenders_batched(files()))
+    assert again == results
+    assert len(calls) == 2
+
+
+def test_batched_call_failure_falls_back_to_each_tender(llm):
+    calls, responses = llm
+    responses.extend([RuntimeError("429 rate limited"), json.dumps(_summary("T-1")), json.dumps(_summary("T-2"))])
+    files = [[_upload("a.pdf", "Tender No: AA/1111")], [_upload("b.pdf", "Tender No: BB/2222")]]
+
+    results = asyncio.run(summarizer.process_tenders_batched(files))
+
+    assert len(calls) == 3
+    assert sorted(r["tender_meta"]["tender_id"] for r in results) == ["T-1", "T-2"]
+
+
+def test_prompts_do_not_depend_on_rule_data_key_order():
+    text = "Tender No: AA/1111"
+    first = {"portal": "Generic", "tender_id": "AA/1111", "emd_amount": "1000"}
+    second = dict(reversed(list(first.items())))
+    sections = {}
+
+    single = [summarizer._build_single_pass_prompt(text, d, "Generic", None, sections) for d in (first, second)]
+    assert single[0] == single[1]
+    batched = [summarizer._build_batched_prompt([text, text], [d, d], [sections] * 2, [5, 5], "Generic")
+               for d in (first, second)]
+    assert batched[0] == batched[1]
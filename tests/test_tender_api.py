@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+
+from app.api import tender
+from app.main import app
+
+
+def test_process_batch_summarizes_each_file_as_a_tender(monkeypatch):
+    seen = []
+
+    async def fake_batched(tenders):
+        seen.append([[f.filename for f in files] for files in tenders])
+        return [{"tender_meta": {"tender_id": f"T-{i}"}, "_metadata": {"portal_type": "Generic"}}
+                for i in range(len(tenders))]
+
+    monkeypatch.setattr(tender, "process_tenders_batched", fake_batched)
+    files = [("pdf_files", (name, b"%PDF-1.4", "application/pdf")) for name in ("a.pdf", "b.pdf")]
+
+    res = TestClient(app).post("/tender/process-batch", files=files)
+
+    assert res.status_code == 200
+    assert seen == [[["a.pdf"], ["b.pdf"]]]
+    assert [r["tender_id"] for r in res.json()["results"]] == ["T-0", "T-1"]
+
+
+def test_process_batch_rejects_non_pdf():
+    files = [("pdf_files", ("a.txt", b"x", "text/plain"))]
+    res = TestClient(app).post("/tender/process-batch", files=files)
+    assert res.status_code == 400